@@ -4,26 +4,62 @@
 # - Redeem rewards
 # - Admin CRUD: add/delete customers & rewards
 # - Employee operations: issue points, process orders
+# - Async variants of the write operations for the GUI
 
-from dataclasses import dataclass
+import asyncio
+import re
+from dataclasses import dataclass, field
 from typing import List, Optional
 
 import data_layer
 
-@dataclass
+# local@domain.tld with no whitespace or extra '@'
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+def is_valid_email(email: str) -> bool:
+    """The email check add_customer enforces (also used by the GUI)."""
+    return _EMAIL_RE.fullmatch(email) is not None
+
+@dataclass(slots=True, frozen=True)
 class Customer:
     id: int
     name: str
     email: str
     points: int
+    # List-row text, built on first use and then kept (instances are
+    # immutable, so a changed customer is a new object with fresh strings).
+    # Lazy so a fetch doesn't format rows a VirtualList never shows.
+    _display_long: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _display_short: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def display_long(self) -> str:
+        if self._display_long is None:
+            object.__setattr__(
+                self, "_display_long", f"{self.name} ({self.email}) - {self.points} pts"
+            )
+        return self._display_long
 
-@dataclass
+    @property
+    def display_short(self) -> str:
+        if self._display_short is None:
+            object.__setattr__(self, "_display_short", f"{self.name} - {self.points} pts")
+        return self._display_short
+
+@dataclass(slots=True, frozen=True)
 class Reward:
     id: int
     name: str
     cost: int
+    _display: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def display(self) -> str:
+        if self._display is None:
+            object.__setattr__(self, "_display", f"{self.name} - {self.cost} pts")
+        return self._display
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OrderSummary:
     id: int
     customer_id: int
@@ -34,6 +70,18 @@ class OrderSummary:
     points_spent: int
     status: str
     order_time: str
+    _display: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def display(self) -> str:
+        if self._display is None:
+            object.__setattr__(
+                self,
+                "_display",
+                f"{self.customer_name} -> {self.reward_name} x{self.quantity} "
+                f"({self.points_spent} pts)",
+            )
+        return self._display
 
 class RewardShopService:
     """
@@ -41,20 +89,30 @@ class RewardShopService:
     Handles loading domain objects and applying business rules.
     """
 
+    def __init__(self):
+        # Bumped by every write that changes the matching list, so callers
+        # can skip re-fetching a list that hasn't changed.
+        self._customers_version = 0
+        self._rewards_version = 0
+        self._orders_version = 0
+
+    def customers_version(self) -> int:
+        return self._customers_version
+
+    def rewards_version(self) -> int:
+        return self._rewards_version
+
+    def orders_version(self) -> int:
+        return self._orders_version
+
     # ---------- Load data as business objects ----------
+    # Rows are built straight into the dataclasses while fetching
+    # (field order matches the SELECT column order).
     def get_customers(self) -> List[Customer]:
-        rows = data_layer.get_all_customers()
-        return [
-            Customer(id=row[0], name=row[1], email=row[2], points=row[3])
-            for row in rows
-        ]
+        return data_layer.get_all_customers(factory=Customer)
 
     def get_rewards(self) -> List[Reward]:
-        rows = data_layer.get_all_rewards()
-        return [
-            Reward(id=row[0], name=row[1], cost=row[2])
-            for row in rows
-        ]
+        return data_layer.get_all_rewards(factory=Reward)
 
     def get_customer(self, customer_id: int) -> Optional[Customer]:
         row = data_layer.get_customer_by_id(customer_id)
@@ -74,43 +132,51 @@ class RewardShopService:
         """
         Deducts points from the customer and records an order with status 'pending',
         if they have enough points. Raises ValueError if rules are violated.
+        The balance check, deduction and order insert run in one transaction.
         """
         if quantity < 1:
             raise ValueError("Quantity must be at least 1.")
 
-        customer = self.get_customer(customer_id)
-        if not customer:
-            raise ValueError("Customer not found.")
-
-        reward = self.get_reward(reward_id)
-        if not reward:
-            raise ValueError("Reward not found.")
-
-        total_cost = reward.cost * quantity
-
-        if customer.points < total_cost:
-            raise ValueError(
-                f"{customer.name} does not have enough points. "
-                f"Has {customer.points}, needs {total_cost}."
-            )
-
-        # Compute new point balance
-        new_points = customer.points - total_cost
-
-        # Persist changes in the data tier
-        data_layer.update_customer_points(customer_id, new_points)
-        # status will default to 'pending' inside insert_order
-        data_layer.insert_order(
+        cust_row, reward_row, total_cost = data_layer.redeem_atomic(
             customer_id=customer_id,
             reward_id=reward_id,
             quantity=quantity,
-            points_spent=total_cost,
         )
+        self._customers_version += 1
+        self._orders_version += 1
 
         # Return the updated Customer object and some info
-        updated_customer = self.get_customer(customer_id)
+        updated_customer = Customer(
+            id=cust_row[0], name=cust_row[1], email=cust_row[2], points=cust_row[3]
+        )
+        reward = Reward(id=reward_row[0], name=reward_row[1], cost=reward_row[2])
         return updated_customer, reward, total_cost
 
+    def redeem_bulk(self, items) -> List[tuple]:
+        """
+        Redeem several (customer_id, reward_id, quantity) items at once.
+        All items are validated and recorded in a single transaction, so either
+        every order is created or none is. Returns a list of
+        (updated_customer, reward, total_cost), one per item.
+        """
+        items = list(items)
+        if not items:
+            raise ValueError("Nothing to redeem.")
+        if any(quantity < 1 for _, _, quantity in items):
+            raise ValueError("Quantity must be at least 1.")
+
+        results = data_layer.redeem_bulk_atomic(items)
+        self._customers_version += 1
+        self._orders_version += 1
+        return [
+            (
+                Customer(id=c[0], name=c[1], email=c[2], points=c[3]),
+                Reward(id=r[0], name=r[1], cost=r[2]),
+                total_cost,
+            )
+            for c, r, total_cost in results
+        ]
+
     # ---------- Admin operations ----------
 
     def add_customer(self, name: str, email: str, points: int):
@@ -122,18 +188,21 @@ class RewardShopService:
 
         if not name:
             raise ValueError("Name is required.")
-        if not email or "@" not in email:
+        if not is_valid_email(email):
             raise ValueError("A valid email is required.")
         if points < 0:
             raise ValueError("Points cannot be negative.")
 
         data_layer.insert_customer(name, email, points)
+        self._customers_version += 1
 
     def delete_customer(self, customer_id: int):
         """
         Delete a customer (and any related orders via FK, if configured).
         """
         data_layer.delete_customer(customer_id)
+        self._customers_version += 1
+        self._orders_version += 1
 
     def add_reward(self, name: str, cost: int):
         """
@@ -146,31 +215,20 @@ class RewardShopService:
             raise ValueError("Reward cost must be greater than 0.")
 
         data_layer.insert_reward(name, cost)
+        self._rewards_version += 1
 
     def delete_reward(self, reward_id: int):
         """
         Delete a reward (and any related orders via FK, if configured).
         """
         data_layer.delete_reward(reward_id)
+        self._rewards_version += 1
+        self._orders_version += 1
 
     # ---------- Employee operations: pending orders + issuing points ----------
 
     def get_pending_orders(self) -> List[OrderSummary]:
-        rows = data_layer.get_pending_orders_with_details()
-        return [
-            OrderSummary(
-                id=row[0],
-                customer_id=row[1],
-                customer_name=row[2],
-                reward_id=row[3],
-                reward_name=row[4],
-                quantity=row[5],
-                points_spent=row[6],
-                status=row[7],
-                order_time=row[8],
-            )
-            for row in rows
-        ]
+        return data_layer.get_pending_orders_with_details(factory=OrderSummary)
 
     def issue_points(self, customer_id: int, points: int) -> Customer:
         """
@@ -179,56 +237,55 @@ class RewardShopService:
         if points <= 0:
             raise ValueError("Points to add must be greater than 0.")
 
-        customer = self.get_customer(customer_id)
-        if not customer:
+        # Single UPDATE ... points + ?, which also returns the new row
+        row = data_layer.add_customer_points(customer_id, points)
+        if not row:
             raise ValueError("Customer not found.")
-
-        new_points = customer.points + points
-        data_layer.update_customer_points(customer_id, new_points)
-        updated = self.get_customer(customer_id)
-        return updated
+        self._customers_version += 1
+        return Customer(id=row[0], name=row[1], email=row[2], points=row[3])
 
     def fulfill_order(self, order_id: int):
         """
         Mark an order as fulfilled. Points were already deducted when the order was created,
         so we just flip the status.
         """
-        row = data_layer.get_order_by_id(order_id)
-        if not row:
-            raise ValueError("Order not found.")
-
-        status = row[6]
-        if status != "pending":
-            raise ValueError(f"Order is not pending (current status: {status}).")
-
-        data_layer.update_order_status(order_id, "fulfilled")
+        data_layer.fulfill_order_atomic(order_id)
+        self._orders_version += 1
 
     def cancel_order(self, order_id: int) -> Customer:
         """
         Cancel an order:
           - Refund points_spent back to the customer's account.
           - Mark the order as 'cancelled'.
-        Returns the updated Customer object.
+        Both steps run in one transaction. Returns the updated Customer object.
         """
-        row = data_layer.get_order_by_id(order_id)
-        if not row:
-            raise ValueError("Order not found.")
+        row = data_layer.cancel_order_atomic(order_id)
+        self._customers_version += 1
+        self._orders_version += 1
+        return Customer(id=row[0], name=row[1], email=row[2], points=row[3])
+
+    # ---------- Async variants (blocking DB work runs in a worker thread) ----------
+
+    async def redeem_reward_async(self, customer_id: int, reward_id: int, quantity: int):
+        return await asyncio.to_thread(self.redeem_reward, customer_id, reward_id, quantity)
+
+    async def issue_points_async(self, customer_id: int, points: int) -> Customer:
+        return await asyncio.to_thread(self.issue_points, customer_id, points)
+
+    async def fulfill_order_async(self, order_id: int):
+        return await asyncio.to_thread(self.fulfill_order, order_id)
 
-        order_id_db, customer_id, reward_id, quantity, points_spent, order_time, status = row
-        if status != "pending":
-            raise ValueError(f"Order is not pending (current status: {status}).")
+    async def cancel_order_async(self, order_id: int) -> Customer:
+        return await asyncio.to_thread(self.cancel_order, order_id)
 
-        customer = self.get_customer(customer_id)
-        if not customer:
-            raise ValueError("Customer not found for this order.")
+    async def add_customer_async(self, name: str, email: str, points: int):
+        return await asyncio.to_thread(self.add_customer, name, email, points)
 
-        # Refund points
-        new_points = customer.points + points_spent
-        data_layer.update_customer_points(customer_id, new_points)
+    async def delete_customer_async(self, customer_id: int):
+        return await asyncio.to_thread(self.delete_customer, customer_id)
 
-        # Update order status
-        data_layer.update_order_status(order_id, "cancelled")
+    async def add_reward_async(self, name: str, cost: int):
+        return await asyncio.to_thread(self.add_reward, name, cost)
 
-        # Return updated customer
-        updated_customer = self.get_customer(customer_id)
-        return updated_customer
+    async def delete_reward_async(self, reward_id: int):
+        return await asyncio.to_thread(self.delete_reward, reward_id)
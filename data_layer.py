@@ -3,143 +3,271 @@
 # loading customers and rewards, updating points, inserting orders,
 # and basic admin CRUD for customers/rewards.
 
+import atexit
+import contextlib
 import sqlite3
+import threading
 from pathlib import Path
-from datetime import datetime
 
 DB_FILE = Path("rewards_shop.db")
 
+# One cached connection per thread, reused by every helper below.
+_tls = threading.local()
+
 def get_connection():
-    """Return a new SQLite connection with foreign keys enabled."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    """Return this thread's cached SQLite connection, opening it on first use."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        # isolation_level=None: autocommit by default; multi-statement writes
+        # open their own BEGIN IMMEDIATE ... COMMIT explicitly.
+        conn = sqlite3.connect(
+            DB_FILE, check_same_thread=False, cached_statements=256, isolation_level=None
+        )
+        conn.execute("PRAGMA foreign_keys = ON;")
+        # synchronous/temp_store/mmap_size are per-connection settings
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
+        _tls.conn = conn
     return conn
 
 
+def close_connection():
+    """Close this thread's cached connection, if one is open."""
+    conn = getattr(_tls, "conn", None)
+    if conn is not None:
+        conn.close()
+        _tls.conn = None
+
+
+atexit.register(close_connection)
+
+
+@contextlib.contextmanager
+def _transaction():
+    """
+    Run the block in one BEGIN IMMEDIATE transaction on the cached connection:
+    commit on success, roll back and re-raise on error. Unlike `with conn:`
+    this also opens the transaction, and never closes the shared connection.
+    """
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+# Bump when init_db gains a new table/column/index so existing DBs re-run it.
+SCHEMA_VERSION = 2
+
+
 def init_db():
     """Create tables if they don't exist and seed some sample data."""
     conn = get_connection()
     cur = conn.cursor()
 
-    # Create customers table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS customers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            points INTEGER NOT NULL
-        );
-    """)
-
-    # Create rewards table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS rewards (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            cost INTEGER NOT NULL
-        );
-    """)
-
-    # Create orders table (without assuming status exists yet)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS orders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            customer_id INTEGER NOT NULL,
-            reward_id INTEGER NOT NULL,
-            quantity INTEGER NOT NULL,
-            points_spent INTEGER NOT NULL,
-            order_time TEXT NOT NULL,
-            status TEXT NOT NULL DEFAULT 'pending',
-            FOREIGN KEY(customer_id) REFERENCES customers(id),
-            FOREIGN KEY(reward_id) REFERENCES rewards(id)
-        );
-    """)
-
-    # --- Migration safety: ensure 'status' column exists even on older DBs ---
-    cur.execute("PRAGMA table_info(orders);")
-    cols = cur.fetchall()  # (cid, name, type, notnull, dflt_value, pk)
-    col_names = {c[1] for c in cols}
-    if "status" not in col_names:
-        cur.execute("ALTER TABLE orders ADD COLUMN status TEXT NOT NULL DEFAULT 'pending';")
-
-    # Seed customers if table empty
-    cur.execute("SELECT COUNT(*) FROM customers;")
-    (count_customers,) = cur.fetchone()
-    if count_customers == 0:
-        cur.executemany("""
-            INSERT INTO customers (name, email, points)
-            VALUES (?, ?, ?);
-        """, [
-            ("Alice", "alice@example.com", 100),
-            ("Bob", "bob@example.com", 60),
-            ("Chris", "chris@example.com", 250),
-        ])
-
-    # Seed rewards if table empty
-    cur.execute("SELECT COUNT(*) FROM rewards;")
-    (count_rewards,) = cur.fetchone()
-    if count_rewards == 0:
-        cur.executemany("""
-            INSERT INTO rewards (name, cost)
-            VALUES (?, ?);
-        """, [
-            ("Booster Pack", 20),
-            ("Playmat", 50),
-            ("Sleeves", 15),
-            ("Starter Deck", 40),
-        ])
-
-    conn.commit()
-    conn.close()
+    # Already set up by a previous run: skip the schema checks entirely
+    cur.execute("PRAGMA user_version;")
+    (user_version,) = cur.fetchone()
+    if user_version >= SCHEMA_VERSION:
+        return
+
+    # WAL is persistent in the database file, so setting it once here is enough
+    # (journal_mode can't change inside a transaction, so do it before BEGIN)
+    cur.execute("PRAGMA journal_mode = WAL;")
+
+    with _transaction():
+        # Create customers table
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS customers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                points INTEGER NOT NULL
+            );
+        """)
+
+        # Create rewards table
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS rewards (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                cost INTEGER NOT NULL
+            );
+        """)
+
+        # Create orders table (without assuming status exists yet)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                customer_id INTEGER NOT NULL,
+                reward_id INTEGER NOT NULL,
+                quantity INTEGER NOT NULL,
+                points_spent INTEGER NOT NULL,
+                order_time TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                FOREIGN KEY(customer_id) REFERENCES customers(id),
+                FOREIGN KEY(reward_id) REFERENCES rewards(id)
+            );
+        """)
+
+        # --- Migration safety: ensure 'status' column exists even on older DBs ---
+        cur.execute("PRAGMA table_info(orders);")
+        cols = cur.fetchall()  # (cid, name, type, notnull, dflt_value, pk)
+        col_names = {c[1] for c in cols}
+        if "status" not in col_names:
+            cur.execute("ALTER TABLE orders ADD COLUMN status TEXT NOT NULL DEFAULT 'pending';")
+
+        # Indexes: a partial index holding only pending rows (already in order_time
+        # order) for the employee queue, plus a lookup index for a customer's orders
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_orders_pending
+            ON orders(order_time) WHERE status = 'pending';
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_id);")
+
+        # Seed customers if table empty
+        cur.execute("SELECT COUNT(*) FROM customers;")
+        (count_customers,) = cur.fetchone()
+        if count_customers == 0:
+            cur.executemany("""
+                INSERT INTO customers (name, email, points)
+                VALUES (?, ?, ?);
+            """, [
+                ("Alice", "alice@example.com", 100),
+                ("Bob", "bob@example.com", 60),
+                ("Chris", "chris@example.com", 250),
+            ])
+
+        # Seed rewards if table empty
+        cur.execute("SELECT COUNT(*) FROM rewards;")
+        (count_rewards,) = cur.fetchone()
+        if count_rewards == 0:
+            cur.executemany("""
+                INSERT INTO rewards (name, cost)
+                VALUES (?, ?);
+            """, [
+                ("Booster Pack", 20),
+                ("Playmat", 50),
+                ("Sleeves", 15),
+                ("Starter Deck", 40),
+            ])
+
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+
+# ---------- SQL statements ----------
+# Kept as module-level constants so every call passes the same SQL text and
+# hits the connection's prepared-statement cache instead of re-parsing.
+_SQL_ALL_CUSTOMERS = "SELECT id, name, email, points FROM customers ORDER BY name;"
+_SQL_ALL_REWARDS = "SELECT id, name, cost FROM rewards ORDER BY cost;"
+_SQL_GET_CUSTOMER = "SELECT id, name, email, points FROM customers WHERE id = ?;"
+_SQL_GET_CUSTOMER_AND_REWARD = """
+    SELECT c.id, c.name, c.email, c.points, r.id, r.name, r.cost
+    FROM (SELECT 1)
+    LEFT JOIN customers AS c ON c.id = ?
+    LEFT JOIN rewards   AS r ON r.id = ?;
+"""
+_SQL_GET_REWARD = "SELECT id, name, cost FROM rewards WHERE id = ?;"
+_SQL_SET_POINTS = "UPDATE customers SET points = ? WHERE id = ?;"
+_SQL_DEDUCT_POINTS = "UPDATE customers SET points = points - ? WHERE id = ? AND points >= ?;"
+_SQL_ADD_POINTS = "UPDATE customers SET points = points + ? WHERE id = ?;"
+
+# UPDATE ... RETURNING (SQLite 3.35+) hands back the updated customer row
+# from the same statement, saving a follow-up SELECT.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING_CUSTOMER = {
+    sql: sql.rstrip(";") + " RETURNING id, name, email, points;"
+    for sql in (_SQL_SET_POINTS, _SQL_DEDUCT_POINTS, _SQL_ADD_POINTS)
+}
+# order_time is stamped by SQLite itself (local ISO-8601 with millisecond
+# precision, e.g. 2024-05-01T14:03:07.123) so no timestamp is built in
+# Python per insert.
+_SQL_INSERT_ORDER = """
+    INSERT INTO orders (customer_id, reward_id, quantity, points_spent, order_time, status)
+    VALUES (?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'), ?);
+"""
+_SQL_GET_ORDER = """
+    SELECT id, customer_id, reward_id, quantity, points_spent, order_time, status
+    FROM orders
+    WHERE id = ?;
+"""
+_SQL_SET_ORDER_STATUS = "UPDATE orders SET status = ? WHERE id = ?;"
+_SQL_FULFILL_PENDING = "UPDATE orders SET status = 'fulfilled' WHERE id = ? AND status = 'pending';"
+_SQL_PENDING_ORDERS = """
+    SELECT
+        o.id,
+        o.customer_id,
+        c.name AS customer_name,
+        o.reward_id,
+        r.name AS reward_name,
+        o.quantity,
+        o.points_spent,
+        o.status,
+        o.order_time
+    FROM orders AS o
+    JOIN customers AS c ON o.customer_id = c.id
+    JOIN rewards   AS r ON o.reward_id   = r.id
+    WHERE o.status = 'pending'
+    ORDER BY o.order_time ASC;
+"""
+_SQL_INSERT_CUSTOMER = "INSERT INTO customers (name, email, points) VALUES (?, ?, ?);"
+_SQL_DELETE_CUSTOMER = "DELETE FROM customers WHERE id = ?;"
+_SQL_INSERT_REWARD = "INSERT INTO rewards (name, cost) VALUES (?, ?);"
+_SQL_DELETE_REWARD = "DELETE FROM rewards WHERE id = ?;"
 
 # ---------- Basic CRUD helper functions ----------
-def get_all_customers():
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id, name, email, points FROM customers ORDER BY name;")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+# Helpers call conn.execute() directly, which hands back a cursor without
+# allocating a separate one up front.
+def _update_customer_returning(conn, sql, params, customer_id: int):
+    """
+    Run a points UPDATE and return the customer's new row,
+    or None if no row matched.
+    """
+    if _HAS_RETURNING:
+        return conn.execute(_RETURNING_CUSTOMER[sql], params).fetchone()
+    if conn.execute(sql, params).rowcount != 1:
+        return None
+    return conn.execute(_SQL_GET_CUSTOMER, (customer_id,)).fetchone()
 
-def get_all_rewards():
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id, name, cost FROM rewards ORDER BY cost;")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+def _fetch_all(sql, factory=None):
+    """Run a query and return all rows, built as factory(*row) if given."""
+    cur = get_connection().execute(sql)
+    if factory is not None:
+        cur.row_factory = lambda _cur, row: factory(*row)
+    return cur.fetchall()
+
+def get_all_customers(factory=None):
+    return _fetch_all(_SQL_ALL_CUSTOMERS, factory)
+
+def get_all_rewards(factory=None):
+    return _fetch_all(_SQL_ALL_REWARDS, factory)
 
 def get_customer_by_id(customer_id: int):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, name, email, points FROM customers WHERE id = ?;",
-        (customer_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
+    return get_connection().execute(_SQL_GET_CUSTOMER, (customer_id,)).fetchone()
 
 def get_reward_by_id(reward_id: int):
+    return get_connection().execute(_SQL_GET_REWARD, (reward_id,)).fetchone()
+
+def update_customer_points(customer_id: int, new_points: int):
+    """
+    Set a customer's balance. Returns the updated customer row or None.
+    """
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, name, cost FROM rewards WHERE id = ?;",
-        (reward_id,),
+    return _update_customer_returning(
+        conn, _SQL_SET_POINTS, (new_points, customer_id), customer_id
     )
-    row = cur.fetchone()
-    conn.close()
-    return row
 
-def update_customer_points(customer_id: int, new_points: int):
+def add_customer_points(customer_id: int, delta: int):
+    """
+    Add delta to a customer's balance in place (no read-modify-write).
+    Returns the updated customer row, or None if the customer doesn't exist.
+    """
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE customers SET points = ? WHERE id = ?;",
-        (new_points, customer_id),
+    return _update_customer_returning(
+        conn, _SQL_ADD_POINTS, (delta, customer_id), customer_id
     )
-    conn.commit()
-    conn.close()
 
 def insert_order(customer_id: int, reward_id: int,
                  quantity: int, points_spent: int, status: str = "pending"):
@@ -147,102 +275,161 @@ def insert_order(customer_id: int, reward_id: int,
     Insert a new order. Status defaults to 'pending'.
     """
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO orders (customer_id, reward_id, quantity, points_spent, order_time, status)
-        VALUES (?, ?, ?, ?, ?, ?);
-    """, (customer_id, reward_id, quantity, points_spent, datetime.now().isoformat(), status))
-    conn.commit()
-    conn.close()
+    conn.execute(
+        _SQL_INSERT_ORDER,
+        (customer_id, reward_id, quantity, points_spent, status),
+    )
+
+def insert_orders_bulk(rows):
+    """
+    Insert many orders with one executemany inside a single transaction.
+    Each row: (customer_id, reward_id, quantity, points_spent, status)
+    """
+    with _transaction() as conn:
+        conn.executemany(_SQL_INSERT_ORDER, rows)
 
 def get_order_by_id(order_id: int):
     """
     Return a single order row or None.
     Columns: id, customer_id, reward_id, quantity, points_spent, order_time, status
     """
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT id, customer_id, reward_id, quantity, points_spent, order_time, status
-        FROM orders
-        WHERE id = ?;
-    """, (order_id,))
-    row = cur.fetchone()
-    conn.close()
-    return row
+    return get_connection().execute(_SQL_GET_ORDER, (order_id,)).fetchone()
 
 def update_order_status(order_id: int, new_status: str):
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE orders SET status = ? WHERE id = ?;",
-        (new_status, order_id),
-    )
-    conn.commit()
-    conn.close()
+    conn.execute(_SQL_SET_ORDER_STATUS, (new_status, order_id))
 
-def get_pending_orders_with_details():
+def get_pending_orders_with_details(factory=None):
     """
     Return pending orders joined with customer & reward names, newest first-ish.
     Columns:
       id, customer_id, customer_name,
       reward_id, reward_name,
       quantity, points_spent, status, order_time
+    Pass a factory to get factory(*row) objects instead of tuples.
+    """
+    return _fetch_all(_SQL_PENDING_ORDERS, factory)
+
+def get_customer_and_reward(customer_id: int, reward_id: int, conn=None):
+    """
+    Fetch a customer and a reward in one query.
+    Returns a single row: (customer id, name, email, points, reward id, name, cost);
+    the customer or reward half is all None if that id doesn't exist.
+    Pass conn to read inside an open transaction.
+    """
+    conn = conn or get_connection()
+    return conn.execute(_SQL_GET_CUSTOMER_AND_REWARD, (customer_id, reward_id)).fetchone()
+
+# ---------- Atomic order operations (single transaction each) ----------
+def _redeem_in_tx(conn, customer_id: int, reward_id: int, quantity: int):
+    """
+    Deduct one redemption's points inside an already-open transaction.
+    Returns (customer_row, reward_row, total_cost). Raises ValueError.
+    """
+    row = get_customer_and_reward(customer_id, reward_id, conn)
+    if row[0] is None:
+        raise ValueError("Customer not found.")
+    if row[4] is None:
+        raise ValueError("Reward not found.")
+
+    reward = row[4:]
+    total_cost = reward[2] * quantity
+    not_enough = (
+        f"{row[1]} does not have enough points. "
+        f"Has {row[3]}, needs {total_cost}."
+    )
+    if row[3] < total_cost:
+        raise ValueError(not_enough)
+
+    # The conditional UPDATE stays as the real guard against overspending
+    customer = _update_customer_returning(
+        conn, _SQL_DEDUCT_POINTS, (total_cost, customer_id, total_cost), customer_id
+    )
+    if not customer:
+        raise ValueError(not_enough)
+    return customer, reward, total_cost
+
+def redeem_atomic(customer_id: int, reward_id: int, quantity: int):
+    """
+    Deduct points and record a 'pending' order in one transaction.
+    The balance check and deduction happen in a single conditional UPDATE,
+    so concurrent redeems can't overspend.
+    Returns (customer_row, reward_row, total_cost). Raises ValueError.
+    """
+    with _transaction() as conn:
+        customer, reward, total_cost = _redeem_in_tx(conn, customer_id, reward_id, quantity)
+        conn.execute(
+            _SQL_INSERT_ORDER,
+            (customer_id, reward_id, quantity, total_cost, "pending"),
+        )
+    return customer, reward, total_cost
+
+def redeem_bulk_atomic(items):
+    """
+    Redeem many (customer_id, reward_id, quantity) items in one transaction,
+    inserting all the orders with a single executemany. All-or-nothing:
+    if any item fails, nothing is deducted or recorded.
+    Returns a list of (customer_row, reward_row, total_cost), one per item.
+    """
+    results = []
+    order_rows = []
+    with _transaction() as conn:
+        for customer_id, reward_id, quantity in items:
+            result = _redeem_in_tx(conn, customer_id, reward_id, quantity)
+            results.append(result)
+            order_rows.append((customer_id, reward_id, quantity, result[2], "pending"))
+        conn.executemany(_SQL_INSERT_ORDER, order_rows)
+    return results
+
+def cancel_order_atomic(order_id: int):
+    """
+    Refund a pending order's points and mark it 'cancelled' in one transaction.
+    Returns the updated customer row. Raises ValueError.
+    """
+    with _transaction() as conn:
+        order = conn.execute(_SQL_GET_ORDER, (order_id,)).fetchone()
+        if not order:
+            raise ValueError("Order not found.")
+
+        customer_id, points_spent, status = order[1], order[4], order[6]
+        if status != "pending":
+            raise ValueError(f"Order is not pending (current status: {status}).")
+
+        customer = _update_customer_returning(
+            conn, _SQL_ADD_POINTS, (points_spent, customer_id), customer_id
+        )
+        if not customer:
+            raise ValueError("Customer not found for this order.")
+
+        conn.execute(_SQL_SET_ORDER_STATUS, ("cancelled", order_id))
+    return customer
+
+def fulfill_order_atomic(order_id: int):
+    """
+    Flip a pending order to 'fulfilled' with a single conditional UPDATE.
+    Raises ValueError if the order is missing or no longer pending.
     """
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT
-            o.id,
-            o.customer_id,
-            c.name AS customer_name,
-            o.reward_id,
-            r.name AS reward_name,
-            o.quantity,
-            o.points_spent,
-            o.status,
-            o.order_time
-        FROM orders AS o
-        JOIN customers AS c ON o.customer_id = c.id
-        JOIN rewards   AS r ON o.reward_id   = r.id
-        WHERE o.status = 'pending'
-        ORDER BY o.order_time ASC;
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    cur = conn.execute(_SQL_FULFILL_PENDING, (order_id,))
+    if cur.rowcount != 1:
+        row = get_order_by_id(order_id)
+        if not row:
+            raise ValueError("Order not found.")
+        raise ValueError(f"Order is not pending (current status: {row[6]}).")
 
 # ---------- Admin CRUD for customers and rewards ----------
 def insert_customer(name: str, email: str, points: int):
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO customers (name, email, points) VALUES (?, ?, ?);",
-        (name, email, points),
-    )
-    conn.commit()
-    conn.close()
+    conn.execute(_SQL_INSERT_CUSTOMER, (name, email, points))
 
 def delete_customer(customer_id: int):
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM customers WHERE id = ?;", (customer_id,))
-    conn.commit()
-    conn.close()
+    conn.execute(_SQL_DELETE_CUSTOMER, (customer_id,))
 
 def insert_reward(name: str, cost: int):
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT INTO rewards (name, cost) VALUES (?, ?);",
-        (name, cost),
-    )
-    conn.commit()
-    conn.close()
+    conn.execute(_SQL_INSERT_REWARD, (name, cost))
 
 def delete_reward(reward_id: int):
     conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM rewards WHERE id = ?;", (reward_id,))
-    conn.commit()
-    conn.close()
+    conn.execute(_SQL_DELETE_REWARD, (reward_id,))
@@ -4,18 +4,317 @@
 # Employee tab: issue points (left) + process pending orders (right).
 # Admin tab: two-column layout to add/delete customers and rewards.
 
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import inspect
+import operator
+import os
+import re
+from dataclasses import dataclass, field
+from typing import List, Set
 import tkinter as tk
 from tkinter import ttk, messagebox
+import tkinter.font as tkfont
 
 import data_layer
-from business_layer import RewardShopService
-
-print("data_layer module file:", data_layer.__file__)
-print("business_layer module file:", __import__("business_layer").__file__)
+from business_layer import RewardShopService, is_valid_email
+
+# Rows per Listbox.insert call when bulk-filling (keeps each Tcl command small)
+INSERT_CHUNK = 1000
+# How often Tk gives the asyncio loop a turn while coroutines are running
+ASYNC_POLL_MS = 10
+
+# Dialog number check (compiled once; used with fullmatch)
+_INT_RE = re.compile(r"-?\d+")
+
+# Options shared by every Listbox. exportselection=False so selecting in one
+# list (e.g. rewards) doesn't clear the selection in another (customers).
+# Opt in with REWARDSHOP_PLAIN_LISTBOX_FONT=1 to draw the lists in
+# TkFixedFont: plainer monospaced glyphs, but cheaper for Tk to measure and
+# draw than the default UI font when bulk-filling.
+LISTBOX_OPTIONS = {"exportselection": False}
+if os.environ.get("REWARDSHOP_PLAIN_LISTBOX_FONT") == "1":
+    LISTBOX_OPTIONS["font"] = "TkFixedFont"
+
+
+def bulk_update(lb: tk.Listbox, fn):
+    """
+    Run fn() with the Listbox unpacked so Tk skips redrawing it per change,
+    then re-pack it with its original options and position.
+    """
+    if lb.winfo_manager() != "pack":
+        fn()
+        return
+
+    info = lb.pack_info()
+    siblings = lb.master.pack_slaves()
+    pos = siblings.index(lb)
+    lb.pack_forget()
+    try:
+        fn()
+    finally:
+        if pos + 1 < len(siblings):
+            info["before"] = siblings[pos + 1]
+        lb.pack(**info)
+
+
+def fill_listbox(lb: tk.Listbox, rows):
+    """Replace a Listbox's contents using batched variadic inserts."""
+    def fill():
+        lb.delete(0, tk.END)
+        for start in range(0, len(rows), INSERT_CHUNK):
+            lb.insert(tk.END, *rows[start:start + INSERT_CHUNK])
+
+    bulk_update(lb, fill)
+
+
+def iter_widgets(parent, cls):
+    """Yield every descendant of parent that is an instance of cls."""
+    for child in parent.winfo_children():
+        if isinstance(child, cls):
+            yield child
+        yield from iter_widgets(child, cls)
+
+
+def batched(method):
+    """Run an event handler (or handler coroutine) inside RewardShopApp.batch()."""
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with self.batch():
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batch():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class VirtualList:
+    """
+    Listbox that only holds the rows currently scrolled into view.
+    Row text comes from row_fn(i) on demand, so the list can be any length;
+    selection and scrolling are tracked as absolute row numbers. Offers the
+    few Listbox methods the app uses (curselection, selection_set, see, bind).
+    """
+
+    def __init__(self, master, height: int = 12):
+        self.frame = ttk.Frame(master)
+        self.listbox = tk.Listbox(self.frame, height=height, **LISTBOX_OPTIONS)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.row_fn = None
+        self.count = 0
+        self.first = 0        # absolute index of the top visible row
+        self.rows = height    # visible rows; updated as the widget resizes
+        self.selected = None
+        self._active = None
+        # Tk draws each listbox line as linespace + 1 + 2 * selectborderwidth
+        linespace = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace")
+        self._row_height = linespace + 1 + 2 * int(self.listbox.cget("selectborderwidth"))
+        self._chrome = 2 * (int(self.listbox.cget("borderwidth"))
+                            + int(self.listbox.cget("highlightthickness")))
+
+        lb = self.listbox
+        lb.bind("<<ListboxSelect>>", self._on_select)
+        lb.bind("<Configure>", self._on_configure)
+        lb.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        lb.bind("<Button-4>", lambda e: self._scroll(-1))
+        lb.bind("<Button-5>", lambda e: self._scroll(1))
+        lb.bind("<Up>", lambda e: self._step(-1))
+        lb.bind("<Down>", lambda e: self._step(1))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def bind(self, sequence, func):
+        # After our own handlers, so self.selected is current when func runs
+        self.listbox.bind(sequence, func, add="+")
+
+    # ----- Listbox-compatible selection -----
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
+
+    def selection_set(self, i: int):
+        self.selected = i
+        self.render()
+
+    def activate(self, i: int):
+        """Give row i the keyboard focus ring (once it is on screen)."""
+        self._active = i
+        if self.first <= i < self.first + self.rows:
+            self.listbox.activate(i - self.first)
+
+    def see(self, i: int):
+        if i < self.first:
+            self.first = i
+        elif i >= self.first + self.rows:
+            self.first = i - self.rows + 1
+        self.render()
+
+    # ----- Data -----
+    def reset(self, count: int):
+        """New data: back to the top with nothing selected (like a refill)."""
+        self.count = count
+        self.first = 0
+        self.selected = None
+        self._active = None
+        self.render()
+
+    def refresh_row(self, i: int):
+        """Redraw one row if it is on screen."""
+        pos = i - self.first
+        if 0 <= pos < self.rows and i < self.count:
+            self.listbox.delete(pos)
+            self.listbox.insert(pos, self.row_fn(i))
+            if i == self.selected:
+                self.listbox.selection_set(pos)
+
+    def render(self):
+        """Materialize only the visible window of rows."""
+        self.first = max(0, min(self.first, self.count - self.rows))
+        last = min(self.count, self.first + self.rows)
+        lb = self.listbox
+        lb.delete(0, tk.END)
+        if last > self.first:
+            lb.insert(tk.END, *[self.row_fn(i) for i in range(self.first, last)])
+        if self.selected is not None and self.first <= self.selected < last:
+            lb.selection_set(self.selected - self.first)
+        if self._active is not None and self.first <= self._active < last:
+            lb.activate(self._active - self.first)
+        if self.count:
+            self.scrollbar.set(self.first / self.count, last / self.count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # ----- Scrolling -----
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * self.count)
+        elif args[0] == "scroll":
+            step = self.rows if args[2] == "pages" else 1
+            self.first += int(args[1]) * step
+        self.render()
+
+    def _scroll(self, units: int):
+        self.yview("scroll", units * 3, "units")
+        return "break"
+
+    def _step(self, delta: int):
+        if not self.count:
+            return "break"
+        i = 0 if self.selected is None else self.selected + delta
+        self.selected = max(0, min(i, self.count - 1))
+        self.see(self.selected)
+        self.listbox.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _on_select(self, event):
+        # Browse mode can't deselect by hand; an empty selection only means
+        # the selected row is scrolled out of view, so keep self.selected.
+        sel = self.listbox.curselection()
+        if sel:
+            self.selected = self.first + sel[0]
+
+    def _on_configure(self, event):
+        # Only rows that fit completely, so render/see/_step never count a
+        # row below the visible edge as on screen
+        rows = max(1, (event.height - self._chrome) // self._row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+
+class ConfirmBar:
+    """
+    Inline "are you sure?" row: hidden until ask(), then shows the prompt with
+    Confirm / Cancel buttons. Unlike askyesno it doesn't block in a nested
+    event loop, and focus stays where it was (e.g. on the list).
+    """
+
+    def __init__(self, master):
+        self.frame = ttk.Frame(master)
+        self.label = ttk.Label(self.frame)
+        self.label.pack(side=tk.LEFT)
+        ttk.Button(self.frame, text="Confirm", command=self.confirm).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.frame, text="Cancel", command=self.hide).pack(side=tk.LEFT)
+        self._on_confirm = None
+
+    def ask(self, prompt: str, on_confirm):
+        self.label.config(text=prompt)
+        self._on_confirm = on_confirm
+        self.frame.pack(anchor="w", pady=5)
+
+    def confirm(self):
+        on_confirm = self._on_confirm
+        self.hide()
+        if on_confirm is not None:
+            on_confirm()
+
+    def hide(self):
+        self._on_confirm = None
+        self.frame.pack_forget()
+
+
+@dataclass(slots=True)
+class _ListView:
+    """One VirtualList subscribed to a ListModel."""
+    vl: "VirtualList"
+    tab: str
+    needs_reset: bool = True
+    patched_rows: Set[int] = field(default_factory=set)
+
+
+class ListModel:
+    """
+    One list of items shown by several VirtualLists (each with its own row format).
+    Changes only mark views stale; a view is redrawn when sync() is called for
+    the tab it lives on, so hidden tabs cost nothing until they are shown.
+    """
+
+    def __init__(self):
+        self.items = []
+        self._views: List[_ListView] = []
+
+    def subscribe(self, vl: VirtualList, formatter, tab):
+        vl.row_fn = lambda i: formatter(self.items[i])
+        self._views.append(_ListView(vl, str(tab)))
+
+    def set_items(self, items):
+        self.items = list(items)
+        for view in self._views:
+            view.needs_reset = True
+            view.patched_rows.clear()
+
+    def update_item(self, i: int, item):
+        self.items[i] = item
+        for view in self._views:
+            if not view.needs_reset:
+                view.patched_rows.add(i)
+
+    def sync(self, tab):
+        """Bring every view on the given tab up to date."""
+        tab = str(tab)
+        for view in self._views:
+            if view.tab != tab:
+                continue
+            if view.needs_reset:
+                view.vl.reset(len(self.items))
+                view.needs_reset = False
+            for i in view.patched_rows:
+                view.vl.refresh_row(i)
+            view.patched_rows.clear()
 
 
 class RewardShopApp:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, db_ready: bool = True):
         self.root = root
         self.root.title("Rewards Shop (Python 3-Tier Demo)")
         self.service = RewardShopService()
@@ -26,22 +325,68 @@ class RewardShopApp:
         self.pending_orders = []
         self.selected_customer_id = None
         self.selected_reward_id = None
+        # customer id -> row index (same row in all three customer lists)
+        self._cust_index_by_id = {}
+        # order id -> row index in pending_orders / emp_order_list
+        self._order_index_by_id = {}
+        # Shared by the three customer Listboxes; see ListModel
+        self.customer_model = ListModel()
+        # Listboxes on hidden tabs waiting to be filled: lb -> (tab, make_rows)
+        self._stale_lists = {}
+        # Add Customer / Add Reward windows, built on first use: (window, reset)
+        self._add_customer_dialog = None
+        self._add_reward_dialog = None
+        # Service list versions last loaded (-1: never); see load_*
+        self._cust_cache_version = -1
+        self._reward_cache_version = -1
+        self._orders_cache_version = -1
+        # Deferred reloads: names of load_* methods waiting for the idle flush
+        self._dirty = set()
+        self._batch_depth = 0
+        self._flush_pending = False
+        # asyncio loop for service calls; pumped from Tk via root.after
+        self._loop = asyncio.new_event_loop()
+        # Two workers for the blocking DB calls (each holds its own SQLite
+        # connection); coroutines resume on the Tk thread, so only that
+        # thread ever touches widgets.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._loop.set_default_executor(self._executor)
+        self._tasks = set()
+        self._pumping = False
 
         # Build the GUI
         self._build_ui()
 
-        # Load initial data
-        self.load_customers()
-        self.load_rewards()
-        self.load_pending_orders()
+        # Load initial data now, or once the DB has been opened in the
+        # background (the window shows up first, with actions disabled)
+        if db_ready:
+            self.on_db_ready()
+        else:
+            for btn in self._action_buttons:
+                btn.state(["disabled"])
+            self.status_var.set("Opening database...")
+            self.run_async(self._open_db())
 
     # ---------- UI Building ----------
     def _build_ui(self):
         self.root.geometry("1000x500")
 
+        # One named font + style shared by every section header (keep the
+        # Font referenced: Tk deletes a named font when it is collected)
+        self._hdr_font = tkfont.Font(family="Arial", size=12, weight="bold")
+        ttk.Style(self.root).configure("Header.TLabel", font=self._hdr_font)
+
+        # ===== STATUS LINE (non-modal feedback) =====
+        # Packed before the notebook so it keeps its row when the window shrinks
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self.root, textvariable=self.status_var, anchor="w", padding=(10, 2)).pack(
+            side=tk.BOTTOM, fill=tk.X
+        )
+
         # ===== NAV BAR: TABS =====
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = notebook
 
         # Three tabs: Customer / Employee / Admin
         customer_tab = ttk.Frame(notebook, padding=10)
@@ -63,22 +408,22 @@ class RewardShopApp:
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
         # ----- Customers list -----
-        ttk.Label(left_frame, text="Select a Customer", font=("Arial", 12, "bold")).pack(anchor="w")
-        # exportselection=False so selecting in rewards list doesn't clear this
-        self.customer_list = tk.Listbox(left_frame, height=12, exportselection=False)
+        ttk.Label(left_frame, text="Select a Customer", style="Header.TLabel").pack(anchor="w")
+        self.customer_list = VirtualList(left_frame, height=12)
         self.customer_list.pack(fill=tk.BOTH, expand=True, pady=5)
         self.customer_list.bind("<<ListboxSelect>>", self.on_customer_selected)
 
         self.customer_points_label = ttk.Label(left_frame, text="Points: -")
         self.customer_points_label.pack(anchor="w", pady=5)
 
-        ttk.Button(left_frame, text="Refresh Customers", command=self.load_customers).pack(
+        refresh_customers = functools.partial(self.load_customers, force=True)
+        ttk.Button(left_frame, text="Refresh Customers", command=refresh_customers).pack(
             anchor="w", pady=5
         )
 
         # ----- Rewards list -----
-        ttk.Label(right_frame, text="Redeem Rewards", font=("Arial", 12, "bold")).pack(anchor="w")
-        self.reward_list = tk.Listbox(right_frame, height=12, exportselection=False)
+        ttk.Label(right_frame, text="Redeem Rewards", style="Header.TLabel").pack(anchor="w")
+        self.reward_list = tk.Listbox(right_frame, height=12, **LISTBOX_OPTIONS)
         self.reward_list.pack(fill=tk.BOTH, expand=True, pady=5)
         self.reward_list.bind("<<ListboxSelect>>", self.on_reward_selected)
 
@@ -94,8 +439,8 @@ class RewardShopApp:
         self.qty_entry = ttk.Entry(qty_frame, textvariable=self.qty_var, width=5)
         self.qty_entry.pack(side=tk.LEFT, padx=5)
 
-        redeem_btn = ttk.Button(right_frame, text="Redeem Reward", command=self.redeem_click)
-        redeem_btn.pack(anchor="w", pady=10)
+        self.redeem_btn = ttk.Button(right_frame, text="Redeem Reward", command=self.redeem_click)
+        self.redeem_btn.pack(anchor="w", pady=10)
 
         # ===========================
         # EMPLOYEE TAB CONTENT
@@ -107,10 +452,10 @@ class RewardShopApp:
         emp_right.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
         # --- Employee: Issue Points (left) ---
-        ttk.Label(emp_left, text="Issue Points to Customers", font=("Arial", 12, "bold")).pack(
+        ttk.Label(emp_left, text="Issue Points to Customers", style="Header.TLabel").pack(
             anchor="w"
         )
-        self.emp_customer_list = tk.Listbox(emp_left, height=12, exportselection=False)
+        self.emp_customer_list = VirtualList(emp_left, height=12)
         self.emp_customer_list.pack(fill=tk.BOTH, expand=True, pady=5)
 
         points_frame = ttk.Frame(emp_left)
@@ -124,10 +469,11 @@ class RewardShopApp:
         ttk.Button(emp_left, text="Issue Points", command=self.issue_points_click).pack(
             anchor="w", pady=10
         )
+        self.points_confirm = ConfirmBar(emp_left)
 
         # --- Employee: Pending Orders (right) ---
-        ttk.Label(emp_right, text="Pending Orders", font=("Arial", 12, "bold")).pack(anchor="w")
-        self.emp_order_list = tk.Listbox(emp_right, height=12, exportselection=False)
+        ttk.Label(emp_right, text="Pending Orders", style="Header.TLabel").pack(anchor="w")
+        self.emp_order_list = tk.Listbox(emp_right, height=12, **LISTBOX_OPTIONS)
         self.emp_order_list.pack(fill=tk.BOTH, expand=True, pady=5)
 
         emp_order_btns = ttk.Frame(emp_right)
@@ -137,6 +483,7 @@ class RewardShopApp:
                    command=self.fulfill_order_click).pack(side=tk.LEFT, padx=5)
         ttk.Button(emp_order_btns, text="Cancel Order",
                    command=self.cancel_order_click).pack(side=tk.LEFT, padx=5)
+        self.order_confirm = ConfirmBar(emp_right)
 
         # ===========================
         # ADMIN TAB CONTENT
@@ -149,8 +496,8 @@ class RewardShopApp:
         admin_right.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
         # --- Admin Customers ---
-        ttk.Label(admin_left, text="Manage Customers", font=("Arial", 12, "bold")).pack(anchor="w")
-        self.admin_customer_list = tk.Listbox(admin_left, height=12, exportselection=False)
+        ttk.Label(admin_left, text="Manage Customers", style="Header.TLabel").pack(anchor="w")
+        self.admin_customer_list = VirtualList(admin_left, height=12)
         self.admin_customer_list.pack(fill=tk.BOTH, expand=True, pady=5)
 
         admin_cust_btns = ttk.Frame(admin_left)
@@ -162,8 +509,8 @@ class RewardShopApp:
                    command=self.delete_selected_customer).pack(side=tk.LEFT, padx=5)
 
         # --- Admin Rewards ---
-        ttk.Label(admin_right, text="Manage Rewards", font=("Arial", 12, "bold")).pack(anchor="w")
-        self.admin_reward_list = tk.Listbox(admin_right, height=12, exportselection=False)
+        ttk.Label(admin_right, text="Manage Rewards", style="Header.TLabel").pack(anchor="w")
+        self.admin_reward_list = tk.Listbox(admin_right, height=12, **LISTBOX_OPTIONS)
         self.admin_reward_list.pack(fill=tk.BOTH, expand=True, pady=5)
 
         admin_reward_btns = ttk.Frame(admin_right)
@@ -174,60 +521,220 @@ class RewardShopApp:
         ttk.Button(admin_reward_btns, text="Delete Reward",
                    command=self.delete_selected_reward).pack(side=tk.LEFT, padx=5)
 
+        self._reward_listboxes = (self.reward_list, self.admin_reward_list)
+        # Tab of each plainly-filled Listbox, for fill_on_tab()
+        self._list_tabs = {
+            self.reward_list: str(customer_tab),
+            self.admin_reward_list: str(admin_tab),
+            self.emp_order_list: str(employee_tab),
+        }
+
+        # Customer lists only redraw when their tab is showing
+        long_fmt = operator.attrgetter("display_long")
+        short_fmt = operator.attrgetter("display_short")
+        self.customer_model.subscribe(self.customer_list, long_fmt, customer_tab)
+        self.customer_model.subscribe(self.admin_customer_list, long_fmt, admin_tab)
+        self.customer_model.subscribe(self.emp_customer_list, short_fmt, employee_tab)
+        notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # Every button in the tabs needs the DB; see on_db_ready
+        self._action_buttons = list(iter_widgets(notebook, ttk.Button))
+
+    # ---------- Startup ----------
+    async def _open_db(self):
+        try:
+            await asyncio.to_thread(data_layer.init_db)
+        except Exception as e:
+            self.status_var.set("")
+            messagebox.showerror("Database Error", f"Could not open the database: {e}")
+            return
+        self.on_db_ready()
+
+    def on_db_ready(self):
+        """Load the initial data and enable the action buttons."""
+        self.load_customers()
+        self.load_rewards()
+        self.load_pending_orders()
+        for btn in self._action_buttons:
+            btn.state(["!disabled"])
+        self.status_var.set("")
+
     # ---------- Data Loading into UI ----------
-    def load_customers(self):
-        self.customers = self.service.get_customers()
-
-        # Customer tab list
-        self.customer_list.delete(0, tk.END)
-        for c in self.customers:
-            display = f"{c.name} ({c.email}) - {c.points} pts"
-            self.customer_list.insert(tk.END, display)
+    # Each loader is a no-op unless the service's version for that list has
+    # moved since the last load (force=True re-reads regardless).
+    def load_customers(self, force: bool = False):
+        version = self.service.customers_version()
+        if version == self._cust_cache_version and not force:
+            return
+        self.customer_model.set_items(self.service.get_customers())
+        self._cust_cache_version = version
+        self.customers = self.customer_model.items
+        self._cust_index_by_id = {c.id: i for i, c in enumerate(self.customers)}
+
         self.selected_customer_id = None
         self.customer_points_label.config(text="Points: -")
+        self.customer_model.sync(self.notebook.select())
 
-        # Admin tab customer list
-        if hasattr(self, "admin_customer_list"):
-            self.admin_customer_list.delete(0, tk.END)
-            for c in self.customers:
-                display = f"{c.name} ({c.email}) - {c.points} pts"
-                self.admin_customer_list.insert(tk.END, display)
-
-        # Employee tab customer list
-        if hasattr(self, "emp_customer_list"):
-            self.emp_customer_list.delete(0, tk.END)
-            for c in self.customers:
-                display = f"{c.name} - {c.points} pts"
-                self.emp_customer_list.insert(tk.END, display)
-
-    def load_rewards(self):
+    def load_rewards(self, force: bool = False):
+        version = self.service.rewards_version()
+        if version == self._reward_cache_version and not force:
+            return
         self.rewards = self.service.get_rewards()
+        self._reward_cache_version = version
+        rows = [r.display for r in self.rewards]
 
-        # Customer tab reward list
-        self.reward_list.delete(0, tk.END)
-        for r in self.rewards:
-            display = f"{r.name} - {r.cost} pts"
-            self.reward_list.insert(tk.END, display)
+        # Customer tab + admin tab reward lists
+        for lb in self._reward_listboxes:
+            self.fill_on_tab(lb, lambda: rows)
         self.selected_reward_id = None
         self.reward_cost_label.config(text="Cost: -")
 
-        # Admin tab reward list
-        if hasattr(self, "admin_reward_list"):
-            self.admin_reward_list.delete(0, tk.END)
-            for r in self.rewards:
-                display = f"{r.name} - {r.cost} pts"
-                self.admin_reward_list.insert(tk.END, display)
-
-    def load_pending_orders(self):
+    def load_pending_orders(self, force: bool = False):
+        version = self.service.orders_version()
+        if version == self._orders_cache_version and not force:
+            return
         self.pending_orders = self.service.get_pending_orders()
-        if hasattr(self, "emp_order_list"):
-            self.emp_order_list.delete(0, tk.END)
-            for o in self.pending_orders:
-                display = (
-                    f"{o.customer_name} -> {o.reward_name} x{o.quantity} "
-                    f"({o.points_spent} pts)"
-                )
-                self.emp_order_list.insert(tk.END, display)
+        self._order_index_by_id = {o.id: i for i, o in enumerate(self.pending_orders)}
+        self._orders_cache_version = version
+        self.fill_on_tab(
+            self.emp_order_list, lambda: [o.display for o in self.pending_orders]
+        )
+
+    def fill_on_tab(self, lb: tk.Listbox, make_rows):
+        """
+        Fill lb now if its tab is showing; otherwise remember make_rows and
+        fill it when that tab is next selected (see on_tab_changed).
+        """
+        tab = self._list_tabs[lb]
+        if tab == self.notebook.select():
+            self._stale_lists.pop(lb, None)
+            fill_listbox(lb, make_rows())
+        else:
+            self._stale_lists[lb] = (tab, make_rows)
+
+    # ---------- Batched (deferred) reloads ----------
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Collect reload requests until the outermost batch exits, then flush
+        them once at idle time. Reentrant; also keeps nested event loops
+        (e.g. a messagebox) from flushing halfway through a handler.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._schedule_flush()
+
+    def request_reload(self, *names: str):
+        """Mark lists ("customers", "rewards", "pending_orders") for reload."""
+        self._dirty.update(names)
+        if self._batch_depth == 0:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._dirty and not self._flush_pending:
+            self._flush_pending = True
+            self.root.after_idle(self._flush_reloads)
+
+    def _flush_reloads(self):
+        self._flush_pending = False
+        dirty, self._dirty = self._dirty, set()
+        for name in ("customers", "rewards", "pending_orders"):
+            if name in dirty:
+                getattr(self, f"load_{name}")()
+        # One layout/redraw pass for all the lists just refilled (never update(),
+        # which would also run pending events from inside this callback)
+        self.root.update_idletasks()
+
+    # ---------- Async (asyncio loop driven from Tk's event loop) ----------
+    def run_async(self, coro, button=None):
+        """
+        Schedule a handler coroutine; the loop is pumped until it finishes.
+        If button is given it stays disabled while the coroutine runs, so a
+        second click can't submit the same action twice.
+        """
+        task = self._loop.create_task(coro)
+        if button is not None:
+            button.state(["disabled"])
+            task.add_done_callback(lambda _task: self._enable(button))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        if not self._pumping:
+            self._pumping = True
+            self.root.after(0, self._pump_loop)
+        return task
+
+    def _pump_loop(self):
+        # A messagebox inside a coroutine runs a nested Tk loop that can land
+        # back here while the asyncio loop is still running; just reschedule.
+        if not self._loop.is_running():
+            self._loop.call_soon(self._loop.stop)
+            self._loop.run_forever()
+        if self._tasks:
+            self.root.after(ASYNC_POLL_MS, self._pump_loop)
+        else:
+            self._pumping = False
+
+    def _enable(self, button):
+        try:
+            button.state(["!disabled"])
+        except tk.TclError:
+            pass  # window already destroyed (shutting down)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            exc = task.exception()
+            self.root.report_callback_exception(type(exc), exc, exc.__traceback__)
+
+    def close(self):
+        """Cancel outstanding coroutines and close the asyncio loop."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            self._loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+        self._loop.close()
+        self._executor.shutdown(wait=True)
+
+    # ---------- Targeted row updates (no full reload) ----------
+    def update_customer_row(self, customer):
+        """
+        Patch one customer's row in place in every customer list.
+        Falls back to a full reload if the customer isn't loaded.
+        """
+        i = self._cust_index_by_id.get(customer.id)
+        if i is None:
+            self.request_reload("customers")
+            return
+
+        self.customer_model.update_item(i, customer)
+        self.customer_model.sync(self.notebook.select())
+
+        if self.selected_customer_id == customer.id:
+            self.customer_points_label.config(text=f"Points: {customer.points}")
+
+    def remove_order_row(self, order):
+        """Drop one processed order from the pending list without reloading."""
+        idx = self._order_index_by_id.pop(order.id, None)
+        if idx is None:
+            return  # list was reloaded while the order was being processed
+        del self.pending_orders[idx]
+        for i in range(idx, len(self.pending_orders)):
+            self._order_index_by_id[self.pending_orders[i].id] = i
+        # A stale list is refilled from pending_orders when its tab is shown
+        if self.emp_order_list not in self._stale_lists:
+            self.emp_order_list.delete(idx)
+
+    def on_tab_changed(self, event):
+        tab = self.notebook.select()
+        self.customer_model.sync(tab)
+        for lb, (lb_tab, make_rows) in list(self._stale_lists.items()):
+            if lb_tab == tab:
+                del self._stale_lists[lb]
+                fill_listbox(lb, make_rows())
 
     # ---------- Event Handlers (Customer Tab) ----------
     def on_customer_selected(self, event):
@@ -280,9 +787,13 @@ class RewardShopApp:
             messagebox.showerror("Invalid Quantity", "Quantity must be a whole number.")
             return
 
-        # === Call business logic ===
+        self.run_async(self._redeem(customer_id, reward_id, qty), button=self.redeem_btn)
+
+    @batched
+    async def _redeem(self, customer_id: int, reward_id: int, qty: int):
+        # === Call business logic (off the UI thread) ===
         try:
-            updated_customer, reward_obj, total_cost = self.service.redeem_reward(
+            updated_customer, reward_obj, total_cost = await self.service.redeem_reward_async(
                 customer_id=customer_id,
                 reward_id=reward_id,
                 quantity=qty
@@ -291,25 +802,24 @@ class RewardShopApp:
             messagebox.showerror("Cannot Redeem", str(e))
             return
 
-        # === Success message ===
-        messagebox.showinfo(
-            "Redeemed",
-            f"{updated_customer.name} redeemed {qty} x {reward_obj.name}\n"
-            f"Total cost: {total_cost} points\n"
-            f"New balance: {updated_customer.points} points"
+        # === Success message (status line; no modal dialog) ===
+        self.status_var.set(
+            f"{updated_customer.name} redeemed {qty} x {reward_obj.name} "
+            f"for {total_cost} points. New balance: {updated_customer.points} points."
         )
 
-        # === Refresh customers list + orders + reselect same customer ===
-        self.load_customers()
-        self.load_pending_orders()
-        for i, c in enumerate(self.customers):
-            if c.id == updated_customer.id:
-                self.customer_list.selection_set(i)
-                self.customer_list.see(i)
-                self.customer_points_label.config(
-                    text=f"Points: {updated_customer.points}"
-                )
-                break
+        # === Patch the customer's row in place; the new order needs a reload ===
+        self.update_customer_row(updated_customer)
+        self.request_reload("pending_orders")
+        i = self._cust_index_by_id.get(updated_customer.id)
+        if i is not None:
+            self.customer_list.selection_set(i)
+            self.customer_list.activate(i)
+            self.customer_list.see(i)
+            self.selected_customer_id = updated_customer.id
+            self.customer_points_label.config(
+                text=f"Points: {updated_customer.points}"
+            )
 
     # ---------- Employee: Issue Points ----------
     def issue_points_click(self):
@@ -330,26 +840,26 @@ class RewardShopApp:
             messagebox.showerror("Invalid Input", "Points must be greater than 0.")
             return
 
-        if not messagebox.askyesno(
-            "Confirm",
-            f"Issue {points} points to {cust.name}?"
-        ):
-            return
+        self.points_confirm.ask(
+            f"Issue {points} points to {cust.name}?",
+            lambda: self.run_async(self._issue_points(cust, points)),
+        )
 
+    @batched
+    async def _issue_points(self, cust, points: int):
         try:
-            updated_customer = self.service.issue_points(cust.id, points)
+            updated_customer = await self.service.issue_points_async(cust.id, points)
         except Exception as e:
             messagebox.showerror("Error", f"Could not issue points: {e}")
             return
 
-        messagebox.showinfo(
-            "Success",
-            f"Issued {points} points to {updated_customer.name}.\n"
+        self.status_var.set(
+            f"Issued {points} points to {updated_customer.name}. "
             f"New balance: {updated_customer.points} points."
         )
 
-        # Refresh customer lists so all tabs see updated points
-        self.load_customers()
+        # Patch this customer's row so all tabs see updated points
+        self.update_customer_row(updated_customer)
 
     # ---------- Employee: Process Orders ----------
     def fulfill_order_click(self):
@@ -360,21 +870,22 @@ class RewardShopApp:
 
         order = self.pending_orders[idxs[0]]
 
-        if not messagebox.askyesno(
-            "Confirm Fulfill",
+        self.order_confirm.ask(
             f"Fulfill order #{order.id} for {order.customer_name}: "
-            f"{order.reward_name} x{order.quantity}?"
-        ):
-            return
+            f"{order.reward_name} x{order.quantity}?",
+            lambda: self.run_async(self._fulfill_order(order)),
+        )
 
+    @batched
+    async def _fulfill_order(self, order):
         try:
-            self.service.fulfill_order(order.id)
+            await self.service.fulfill_order_async(order.id)
         except Exception as e:
             messagebox.showerror("Error", f"Could not fulfill order: {e}")
             return
 
-        messagebox.showinfo("Fulfilled", f"Order #{order.id} has been fulfilled.")
-        self.load_pending_orders()
+        self.status_var.set(f"Order #{order.id} has been fulfilled.")
+        self.remove_order_row(order)
 
     def cancel_order_click(self):
         idxs = self.emp_order_list.curselection()
@@ -384,33 +895,46 @@ class RewardShopApp:
 
         order = self.pending_orders[idxs[0]]
 
-        if not messagebox.askyesno(
-            "Confirm Cancel",
+        self.order_confirm.ask(
             f"Cancel order #{order.id} for {order.customer_name} "
-            f"(refund {order.points_spent} points)?"
-        ):
-            return
+            f"(refund {order.points_spent} points)?",
+            lambda: self.run_async(self._cancel_order(order)),
+        )
 
+    @batched
+    async def _cancel_order(self, order):
         try:
-            updated_customer = self.service.cancel_order(order.id)
+            updated_customer = await self.service.cancel_order_async(order.id)
         except Exception as e:
             messagebox.showerror("Error", f"Could not cancel order: {e}")
             return
 
-        messagebox.showinfo(
-            "Cancelled",
-            f"Order #{order.id} has been cancelled.\n"
+        self.status_var.set(
+            f"Order #{order.id} has been cancelled. "
             f"{updated_customer.name}'s new balance: {updated_customer.points} points."
         )
 
-        # Refresh both customers & orders
-        self.load_customers()
-        self.load_pending_orders()
+        # Patch just the affected customer and order rows
+        self.update_customer_row(updated_customer)
+        self.remove_order_row(order)
 
     # ---------- Admin: Add/Delete Customers ----------
     def open_add_customer_dialog(self):
+        if self._add_customer_dialog is None:
+            self._add_customer_dialog = self._build_add_customer_dialog()
+        win, reset = self._add_customer_dialog
+        # Only a hidden dialog starts over; an open (or minimized) one keeps
+        # what was typed. deiconify() also restores a minimized window.
+        if win.state() == "withdrawn":
+            reset()
+        win.deiconify()
+        win.lift()
+
+    def _build_add_customer_dialog(self):
+        """Build the Add Customer window once; closing it only hides it."""
         win = tk.Toplevel(self.root)
         win.title("Add Customer")
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
 
         ttk.Label(win, text="Name:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
         name_entry = ttk.Entry(win, width=30)
@@ -423,40 +947,51 @@ class RewardShopApp:
         ttk.Label(win, text="Starting Points:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
         points_entry = ttk.Entry(win, width=10)
         points_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
-        points_entry.insert(0, "0")
+
+        def reset():
+            name_entry.delete(0, tk.END)
+            email_entry.delete(0, tk.END)
+            points_entry.delete(0, tk.END)
+            points_entry.insert(0, "0")
 
         def save():
             name = name_entry.get().strip()
             email = email_entry.get().strip()
             points_text = points_entry.get().strip()
+            invalid = functools.partial(messagebox.showerror, "Invalid Input", parent=win)
 
             if not name:
-                messagebox.showerror("Invalid Input", "Name is required.", parent=win)
+                invalid("Name is required.")
                 return
-            if not email or "@" not in email:
-                messagebox.showerror("Invalid Input", "Valid email is required.", parent=win)
+            if not is_valid_email(email):
+                invalid("Valid email is required.")
                 return
-            try:
-                points = int(points_text)
-            except ValueError:
-                messagebox.showerror("Invalid Input", "Points must be a whole number.", parent=win)
+            if not _INT_RE.fullmatch(points_text):
+                invalid("Points must be a whole number.")
                 return
+            points = int(points_text)
             if points < 0:
-                messagebox.showerror("Invalid Input", "Points cannot be negative.", parent=win)
+                invalid("Points cannot be negative.")
                 return
 
+            self.run_async(do_save(name, email, points), button=save_btn)
+
+        async def do_save(name, email, points):
             try:
-                self.service.add_customer(name, email, points)
+                await self.service.add_customer_async(name, email, points)
             except Exception as e:
                 messagebox.showerror("Error", f"Could not add customer: {e}", parent=win)
                 return
 
             messagebox.showinfo("Success", "Customer added.", parent=win)
-            self.load_customers()
-            win.destroy()
+            self.request_reload("customers")
+            win.withdraw()
 
-        ttk.Button(win, text="Save", command=save).grid(row=3, column=0, padx=5, pady=10)
-        ttk.Button(win, text="Cancel", command=win.destroy).grid(row=3, column=1, padx=5, pady=10)
+        save_btn = ttk.Button(win, text="Save", command=save)
+        save_btn.grid(row=3, column=0, padx=5, pady=10)
+        ttk.Button(win, text="Cancel", command=win.withdraw).grid(row=3, column=1, padx=5, pady=10)
+        reset()
+        return win, reset
 
     def delete_selected_customer(self):
         idxs = self.admin_customer_list.curselection()
@@ -471,19 +1006,36 @@ class RewardShopApp:
         ):
             return
 
+        self.run_async(self._delete_customer(customer))
+
+    @batched
+    async def _delete_customer(self, customer):
         try:
-            self.service.delete_customer(customer.id)
+            await self.service.delete_customer_async(customer.id)
         except Exception as e:
             messagebox.showerror("Error", f"Could not delete customer: {e}")
             return
 
         messagebox.showinfo("Deleted", "Customer deleted.")
-        self.load_customers()
+        self.request_reload("customers")
 
     # ---------- Admin: Add/Delete Rewards ----------
     def open_add_reward_dialog(self):
+        if self._add_reward_dialog is None:
+            self._add_reward_dialog = self._build_add_reward_dialog()
+        win, reset = self._add_reward_dialog
+        # Only a hidden dialog starts over; an open (or minimized) one keeps
+        # what was typed. deiconify() also restores a minimized window.
+        if win.state() == "withdrawn":
+            reset()
+        win.deiconify()
+        win.lift()
+
+    def _build_add_reward_dialog(self):
+        """Build the Add Reward window once; closing it only hides it."""
         win = tk.Toplevel(self.root)
         win.title("Add Reward")
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
 
         ttk.Label(win, text="Name:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
         name_entry = ttk.Entry(win, width=30)
@@ -492,36 +1044,46 @@ class RewardShopApp:
         ttk.Label(win, text="Cost (points):").grid(row=1, column=0, sticky="w", padx=5, pady=5)
         cost_entry = ttk.Entry(win, width=10)
         cost_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
-        cost_entry.insert(0, "0")
+
+        def reset():
+            name_entry.delete(0, tk.END)
+            cost_entry.delete(0, tk.END)
+            cost_entry.insert(0, "0")
 
         def save():
             name = name_entry.get().strip()
             cost_text = cost_entry.get().strip()
+            invalid = functools.partial(messagebox.showerror, "Invalid Input", parent=win)
 
             if not name:
-                messagebox.showerror("Invalid Input", "Name is required.", parent=win)
+                invalid("Name is required.")
                 return
-            try:
-                cost = int(cost_text)
-            except ValueError:
-                messagebox.showerror("Invalid Input", "Cost must be a whole number.", parent=win)
+            if not _INT_RE.fullmatch(cost_text):
+                invalid("Cost must be a whole number.")
                 return
+            cost = int(cost_text)
             if cost <= 0:
-                messagebox.showerror("Invalid Input", "Cost must be greater than 0.", parent=win)
+                invalid("Cost must be greater than 0.")
                 return
 
+            self.run_async(do_save(name, cost), button=save_btn)
+
+        async def do_save(name, cost):
             try:
-                self.service.add_reward(name, cost)
+                await self.service.add_reward_async(name, cost)
             except Exception as e:
                 messagebox.showerror("Error", f"Could not add reward: {e}", parent=win)
                 return
 
             messagebox.showinfo("Success", "Reward added.", parent=win)
-            self.load_rewards()
-            win.destroy()
+            self.request_reload("rewards")
+            win.withdraw()
 
-        ttk.Button(win, text="Save", command=save).grid(row=2, column=0, padx=5, pady=10)
-        ttk.Button(win, text="Cancel", command=win.destroy).grid(row=2, column=1, padx=5, pady=10)
+        save_btn = ttk.Button(win, text="Save", command=save)
+        save_btn.grid(row=2, column=0, padx=5, pady=10)
+        ttk.Button(win, text="Cancel", command=win.withdraw).grid(row=2, column=1, padx=5, pady=10)
+        reset()
+        return win, reset
 
     def delete_selected_reward(self):
         idxs = self.admin_reward_list.curselection()
@@ -536,20 +1098,23 @@ class RewardShopApp:
         ):
             return
 
+        self.run_async(self._delete_reward(reward))
+
+    @batched
+    async def _delete_reward(self, reward):
         try:
-            self.service.delete_reward(reward.id)
+            await self.service.delete_reward_async(reward.id)
         except Exception as e:
             messagebox.showerror("Error", f"Could not delete reward: {e}")
             return
 
         messagebox.showinfo("Deleted", "Reward deleted.")
-        self.load_rewards()
+        self.request_reload("rewards")
 
 
 if __name__ == "__main__":
-    # Initialize DB and launch app
-    data_layer.init_db()
-
+    # Launch app; the DB is initialized in the background once the window is up
     root = tk.Tk()
-    app = RewardShopApp(root)
+    app = RewardShopApp(root, db_ready=False)
     root.mainloop()
+    app.close()